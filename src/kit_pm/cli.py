@@ -5,23 +5,29 @@ The Judge that validates packages before allowing them into your system.
 
 Usage:
     kit install <package>
-    kit search <query>
+    kit search <query> [--limit N]
     kit list
     kit info <package>
-    kit doctor
+    kit doctor [--refresh]
     kit update
     kit config [--ollama-url URL]
 """
 
 import argparse
+import functools
 import json
 import subprocess
 import sys
+import time
 from pathlib import Path
-from typing import Optional
-import requests
+from typing import Dict, Optional
 
-from .core import PackageRegistry, KitValidator, load_config, save_config, get_ollama_url
+from .core import PackageRegistry, KitValidator, load_config, save_config, get_ollama_url, CONFIG_DIR
+
+
+# Cached `kit doctor` results, reused for HEALTH_CACHE_TTL seconds
+HEALTH_CACHE_FILE = CONFIG_DIR / "health_cache.json"
+HEALTH_CACHE_TTL = 30
 
 
 # Colors for terminal output
@@ -35,9 +41,9 @@ class Colors:
     END = '\033[0m'
 
 
-def c(text: str, color: str) -> str:
+def c(text: str, color: str, _end: str = Colors.END) -> str:
     """Colorize text."""
-    return f"{color}{text}{Colors.END}"
+    return color + text + _end
 
 
 def print_banner():
@@ -50,6 +56,31 @@ def print_banner():
 """, Colors.CYAN))
 
 
+def print_config(ollama_url: str):
+    """Print the current configuration section."""
+    print(c(f"\n[CONFIG] Current Configuration\n", Colors.YELLOW))
+    print(f"  Ollama URL: {ollama_url}")
+    print(f"  Config file: ~/.kit/config.json")
+
+
+def _normalize_name(name: str) -> str:
+    """Normalize a PyPI distribution name for comparison."""
+    return name.lower().replace("-", "_")
+
+
+@functools.lru_cache(maxsize=1)
+def _get_installed_packages() -> Dict[str, str]:
+    """Get installed packages as {normalized name: version}."""
+    from importlib.metadata import distributions  # deferred: only list and doctor need it
+
+    installed = {}
+    for dist in distributions():
+        name = dist.metadata["Name"]
+        if name:
+            installed[_normalize_name(name)] = dist.version
+    return installed
+
+
 def cmd_install(args, registry: PackageRegistry, validator: KitValidator):
     """Install a package."""
     pkg_name = args.package.lower()
@@ -82,17 +113,39 @@ def cmd_install(args, registry: PackageRegistry, validator: KitValidator):
             return 1
 
     # Dependencies
+    to_install = [pkg.pypi] if pkg.pypi else []
     if pkg.dependencies:
         print(c(f"\n[CHECK] Dependencies: {', '.join(pkg.dependencies)}", Colors.YELLOW))
-        for dep in pkg.dependencies:
-            dep_pkg = registry.get(dep)
-            if dep_pkg:
+        deps = [(dep, registry.get(dep)) for dep in pkg.dependencies]
+        deps = [(dep, dep_pkg) for dep, dep_pkg in deps if dep_pkg]
+        dep_pkgs = [dep_pkg for _, dep_pkg in deps]
+        # Dependencies pass the same checks as the package itself
+        dep_validations = validator.validate_many(dep_pkgs, "install")
+        failed = []
+        for dep, dep_pkg in deps:
+            dep_validation = dep_validations[dep_pkg.name]
+            if dep_validation["valid"]:
                 print(c(f"  └── {dep}: OK", Colors.GREEN))
-
-    # Install via pip
-    if pkg.pypi:
-        print(c(f"\n[ROUTE] Installing via pip: {pkg.pypi}", Colors.BLUE))
-        result = subprocess.run([sys.executable, "-m", "pip", "install", pkg.pypi, "-q"])
+            else:
+                print(c(f"  └── {dep}: FAILED", Colors.RED))
+                failed.append((dep, dep_validation))
+        if failed and not args.force:
+            print(c(f"\n[BLOCKED] Dependency validation failed:", Colors.RED))
+            for dep, dep_validation in failed:
+                for warning in dep_validation["warnings"]:
+                    print(c(f"  • {dep}: {warning}", Colors.RED))
+            print(f"\n  Use --force to install anyway (not recommended)")
+            return 1
+        for dep_pkg in dep_pkgs:
+            if dep_pkg.pypi and dep_pkg.pypi not in to_install:
+                to_install.append(dep_pkg.pypi)
+
+    # Install via pip, package and dependencies in a single resolver run
+    if to_install:
+        print(c(f"\n[ROUTE] Installing via pip: {' '.join(to_install)}", Colors.BLUE))
+        result = subprocess.run([sys.executable, "-m", "pip", "install", *to_install, "-q"])
+        _get_installed_packages.cache_clear()
+        _clear_health_cache()
         if result.returncode != 0:
             print(c(f"[ERROR] pip install failed", Colors.RED))
             return 1
@@ -111,7 +164,10 @@ def cmd_install(args, registry: PackageRegistry, validator: KitValidator):
 def cmd_search(args, registry: PackageRegistry, validator: KitValidator):
     """Search for packages."""
     query = args.query
-    results = registry.search(query)
+    # One extra result tells whether the limit actually cut anything off
+    results = registry.search(query, limit=args.limit + 1)
+    truncated = len(results) > args.limit
+    results = results[:args.limit]
 
     print(c(f"\n[SEARCH] Searching for: {query}\n", Colors.YELLOW))
 
@@ -127,6 +183,8 @@ def cmd_search(args, registry: PackageRegistry, validator: KitValidator):
         print()
 
     print(c(f"  Found {len(results)} package(s)", Colors.CYAN))
+    if truncated:
+        print(f"  (showing the first {args.limit}, use --limit to see more)")
     return 0
 
 
@@ -137,18 +195,10 @@ def cmd_list(args, registry: PackageRegistry, validator: KitValidator):
     print(c(f"\n[LIST] HumoticaOS Packages\n", Colors.YELLOW))
 
     # Check which packages are installed
-    try:
-        result = subprocess.run(
-            [sys.executable, "-m", "pip", "list", "--format=json"],
-            capture_output=True, text=True
-        )
-        installed = {p["name"].lower().replace("-", "_"): p["version"]
-                    for p in json.loads(result.stdout)}
-    except Exception:
-        installed = {}
+    installed = _get_installed_packages()
 
     for pkg in sorted(packages, key=lambda p: p.name):
-        pypi_name = (pkg.pypi or "").lower().replace("-", "_")
+        pypi_name = _normalize_name(pkg.pypi or "")
         is_installed = pypi_name in installed
         status = c("✓ installed", Colors.GREEN) if is_installed else c("○ available", Colors.YELLOW)
         print(f"  {c(pkg.name, Colors.BOLD):30} {status}")
@@ -183,6 +233,57 @@ def cmd_info(args, registry: PackageRegistry, validator: KitValidator):
     return 0
 
 
+def _probe_url(url: str):
+    """Probe a service URL; returns (status, status_code)."""
+    import urllib.error  # deferred: only `kit doctor` probes URLs
+    import urllib.request
+
+    try:
+        with urllib.request.urlopen(url, timeout=5) as r:
+            return ("up", r.status)
+    except urllib.error.HTTPError as e:
+        return ("down", e.code)
+    except Exception:
+        return ("offline", None)
+
+
+def _load_health_cache(ollama_url: str) -> Optional[dict]:
+    """Load cached doctor results if fresh and for the same Ollama URL and environment."""
+    try:
+        cached = json.loads(HEALTH_CACHE_FILE.read_text())
+        # Package versions belong to one environment; a venv gets its own results
+        if (cached.get("ollama_url") == ollama_url and
+                cached.get("prefix") == sys.prefix and
+                time.time() - cached["ts"] < HEALTH_CACHE_TTL):
+            return cached
+    except Exception:
+        pass
+    return None
+
+
+def _save_health_cache(ollama_url: str, services: list, packages: list):
+    """Save doctor results to ~/.kit/health_cache.json"""
+    try:
+        CONFIG_DIR.mkdir(parents=True, exist_ok=True)
+        HEALTH_CACHE_FILE.write_text(json.dumps({
+            "ts": time.time(),
+            "ollama_url": ollama_url,
+            "prefix": sys.prefix,
+            "services": services,
+            "packages": packages,
+        }))
+    except Exception:
+        pass
+
+
+def _clear_health_cache():
+    """Drop cached doctor results, e.g. after pip changed installed packages."""
+    try:
+        HEALTH_CACHE_FILE.unlink()
+    except OSError:
+        pass
+
+
 def cmd_doctor(args, registry: PackageRegistry, validator: KitValidator):
     """Health check of HumoticaOS components."""
     print(c(f"\n[DOCTOR] HumoticaOS Health Check\n", Colors.YELLOW))
@@ -193,36 +294,44 @@ def cmd_doctor(args, registry: PackageRegistry, validator: KitValidator):
     checks = [
         ("Ollama (local)", f"{ollama_url}/api/tags"),
     ]
+    core_packages = ["mcp-server-rabel", "ainternet"]
+
+    cached = None if args.refresh else _load_health_cache(ollama_url)
+    if cached:
+        services, packages = cached["services"], cached["packages"]
+        print(c(f"  (cached results, use --refresh to re-check)\n", Colors.BLUE))
+    else:
+        from concurrent.futures import ThreadPoolExecutor
+
+        # The probes are independent and I/O bound, so run them all at once
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            service_futures = [executor.submit(_probe_url, url) for _, url in checks]
+            installed_future = executor.submit(_get_installed_packages)
+            services = [f.result() for f in service_futures]
+            installed = installed_future.result()
+        packages = [_normalize_name(p) in installed for p in core_packages]
+        _save_health_cache(ollama_url, services, packages)
 
     all_ok = True
-    for name, url in checks:
-        try:
-            r = requests.get(url, timeout=5)
-            if r.ok:
-                print(c(f"  ✓ {name}: UP", Colors.GREEN))
-            else:
-                print(c(f"  ✗ {name}: DOWN ({r.status_code})", Colors.RED))
-                all_ok = False
-        except Exception:
+    for (name, _), (status, status_code) in zip(checks, services):
+        if status == "up":
+            print(c(f"  ✓ {name}: UP", Colors.GREEN))
+        elif status == "down":
+            print(c(f"  ✗ {name}: DOWN ({status_code})", Colors.RED))
+            all_ok = False
+        else:
             print(c(f"  ○ {name}: not running (optional)", Colors.YELLOW))
 
     # Check core packages
     print(c(f"\n[CHECK] Core Packages\n", Colors.YELLOW))
-    core_packages = ["mcp-server-rabel", "ainternet"]
-    for pkg_name in core_packages:
-        result = subprocess.run(
-            [sys.executable, "-m", "pip", "show", pkg_name],
-            capture_output=True, text=True
-        )
-        if result.returncode == 0:
+    for pkg_name, installed in zip(core_packages, packages):
+        if installed:
             print(c(f"  ✓ {pkg_name}: installed", Colors.GREEN))
         else:
             print(c(f"  ○ {pkg_name}: not installed", Colors.YELLOW))
 
     # Show config
-    print(c(f"\n[CONFIG] Current Configuration\n", Colors.YELLOW))
-    print(f"  Ollama URL: {ollama_url}")
-    print(f"  Config file: ~/.kit/config.json")
+    print_config(ollama_url)
 
     print(c(f"\n[OK] Health check complete!", Colors.GREEN))
     return 0
@@ -254,10 +363,7 @@ def cmd_config(args, registry: PackageRegistry, validator: KitValidator):
             return 1
     elif args.show:
         # Show current config
-        print(c(f"\n[CONFIG] Current Configuration\n", Colors.YELLOW))
-        ollama_url = get_ollama_url()
-        print(f"  Ollama URL: {ollama_url}")
-        print(f"  Config file: ~/.kit/config.json")
+        print_config(get_ollama_url())
         print(f"\n  Set with: kit config --ollama-url http://your-server:11434")
         print(f"  Or env:   export KIT_OLLAMA_URL=http://your-server:11434")
     else:
@@ -269,49 +375,109 @@ def cmd_config(args, registry: PackageRegistry, validator: KitValidator):
         print(f"    kit config --ollama-url URL    Set Ollama server URL")
         print(f"\n  Environment variables:")
         print(f"    KIT_OLLAMA_URL                 Override Ollama URL")
+        print(f"    KIT_NO_CACHE=1                 Don't reuse cached Kit AI answers")
         print(f"\n  Config file: ~/.kit/config.json")
 
     return 0
 
 
-def main():
-    """Main entry point."""
-    parser = argparse.ArgumentParser(
-        description="Kit - HumoticaOS Package Manager",
-        formatter_class=argparse.RawDescriptionHelpFormatter,
-        epilog="One Love, One fAmIly!"
-    )
-
-    subparsers = parser.add_subparsers(dest="command", help="Commands")
-
-    # install
+def _add_install_parser(subparsers):
     install_parser = subparsers.add_parser("install", help="Install a package")
     install_parser.add_argument("package", help="Package name")
     install_parser.add_argument("--force", "-f", action="store_true",
                                help="Force install even if validation fails")
 
-    # search
+
+def _positive_int(value: str) -> int:
+    """argparse type for counts that must be at least 1."""
+    try:
+        number = int(value)
+    except ValueError:
+        number = 0
+    if number < 1:
+        raise argparse.ArgumentTypeError(f"must be a positive integer, got '{value}'")
+    return number
+
+
+def _add_search_parser(subparsers):
     search_parser = subparsers.add_parser("search", help="Search packages")
     search_parser.add_argument("query", help="Search query")
+    search_parser.add_argument("--limit", "-n", type=_positive_int, default=50,
+                               help="Maximum number of results (default: 50)")
+
 
-    # list
+def _add_list_parser(subparsers):
     subparsers.add_parser("list", help="List available packages")
 
-    # info
+
+def _add_info_parser(subparsers):
     info_parser = subparsers.add_parser("info", help="Show package info")
     info_parser.add_argument("package", help="Package name")
 
-    # doctor
-    subparsers.add_parser("doctor", help="Health check")
 
-    # update
+def _add_doctor_parser(subparsers):
+    doctor_parser = subparsers.add_parser("doctor", help="Health check")
+    doctor_parser.add_argument("--refresh", action="store_true",
+                               help="Ignore cached results and re-check")
+
+
+def _add_update_parser(subparsers):
     subparsers.add_parser("update", help="Update package registry")
 
-    # config
+
+def _add_config_parser(subparsers):
     config_parser = subparsers.add_parser("config", help="Configure Kit settings")
     config_parser.add_argument("--ollama-url", help="Set Ollama server URL")
     config_parser.add_argument("--show", action="store_true", help="Show current config")
 
+
+# Subparser builders, in help order
+SUBPARSERS = {
+    "install": _add_install_parser,
+    "search": _add_search_parser,
+    "list": _add_list_parser,
+    "info": _add_info_parser,
+    "doctor": _add_doctor_parser,
+    "update": _add_update_parser,
+    "config": _add_config_parser,
+}
+
+
+class _LazyArgumentParser(argparse.ArgumentParser):
+    """ArgumentParser that reports errors with the usage of every command."""
+
+    # True when only some subcommands were built
+    partial = False
+
+    def error(self, message):
+        if self.partial:
+            # The usage line lists the built subcommands; show them all
+            _build_parser(SUBPARSERS).error(message)
+        super().error(message)
+
+
+def _build_parser(commands) -> argparse.ArgumentParser:
+    """Build the kit argument parser with the given subcommands."""
+    parser = _LazyArgumentParser(
+        description="Kit - HumoticaOS Package Manager",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="One Love, One fAmIly!"
+    )
+
+    subparsers = parser.add_subparsers(dest="command", help="Commands")
+    for name in commands:
+        SUBPARSERS[name](subparsers)
+    parser.partial = len(commands) < len(SUBPARSERS)
+    return parser
+
+
+def main():
+    """Main entry point."""
+    # Only build the subparser that is about to run; all of them for the
+    # top-level help, unknown commands and option-first invocations
+    command = sys.argv[1] if len(sys.argv) > 1 else None
+    parser = _build_parser([command] if command in SUBPARSERS else SUBPARSERS)
+
     args = parser.parse_args()
 
     if not args.command:
@@ -6,45 +6,159 @@ JIS = The Law
 SNAFT = The Police
 """
 
+import bisect
+import contextlib
+import functools
 import json
+import mmap
 import os
+import pickle
+import shutil
+import sys
+import tempfile
+import threading
+import time
 from pathlib import Path
-from typing import Optional, Dict, List, Any
-from dataclasses import dataclass
-import requests
+from typing import TYPE_CHECKING, Optional, Dict, List, Any, Tuple
+from dataclasses import dataclass, field, fields
+
+if TYPE_CHECKING:
+    from concurrent.futures import Future
+
+try:
+    import orjson
+except ImportError:  # optional: pip install kit-pm[fast]
+    orjson = None
+
+
+def _json_loads(data: bytes) -> Any:
+    """Parse JSON bytes, with orjson when available."""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def _json_load_file(path: Path) -> Any:
+    """
+    Parse a JSON file.
+
+    With orjson the file is parsed straight from an mmap, without first
+    copying its contents onto the heap.
+    """
+    if orjson is not None:
+        with open(path, "rb") as f:
+            try:
+                mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            except (OSError, ValueError):
+                mm = None  # empty file, or a filesystem without mmap
+            if mm is not None:
+                with mm, memoryview(mm) as view:
+                    return orjson.loads(view)
+    return _json_loads(Path(path).read_bytes())
+
+
+def _json_dumps(obj: Any, indent: bool = False) -> bytes:
+    """Serialize to JSON bytes, with orjson when available."""
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2 if indent else 0)
+    return json.dumps(obj, indent=2 if indent else None).encode()
+
+
+@contextlib.contextmanager
+def _atomic_open(path: Path):
+    """
+    Open a temp file for binary writing that replaces path on success.
+
+    Readers see either the old or the new contents, never a partial
+    write. If the block raises, path is left untouched.
+    """
+    # A unique temp file, so concurrent writers never share one
+    fd, tmp = tempfile.mkstemp(dir=path.parent, prefix=path.name + ".", suffix=".tmp")
+    try:
+        # mkstemp creates 0600; keep the target's mode so a shared
+        # registry stays readable. Opened by path so f.name is the temp
+        # file, not the descriptor.
+        try:
+            mode = os.stat(path).st_mode & 0o777
+        except FileNotFoundError:
+            mode = 0o644
+        os.close(fd)
+        os.chmod(tmp, mode)
+        with open(tmp, "wb") as f:
+            yield f
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, path)
+    except BaseException:
+        with contextlib.suppress(OSError):
+            os.unlink(tmp)
+        raise
+
+
+def _atomic_write(path: Path, data: bytes):
+    """Write data to path atomically, see _atomic_open()."""
+    with _atomic_open(path) as f:
+        f.write(data)
 
 
 # Configuration
 CONFIG_DIR = Path.home() / ".kit"
 CONFIG_FILE = CONFIG_DIR / "config.json"
+# Pickled Package objects of the last loaded registry
+REGISTRY_CACHE_FILE = CONFIG_DIR / "packages.pkl"
+# ETag/Last-Modified of the last registry download
+REGISTRY_ETAG_FILE = CONFIG_DIR / "registry_etag.json"
+
+
+# (mtime_ns, size) of config.json and its parsed contents
+_CONFIG_CACHE: Optional[Tuple[Tuple[int, int], Dict[str, Any]]] = None
 
 
 def load_config() -> Dict[str, Any]:
     """Load Kit configuration from ~/.kit/config.json"""
-    if CONFIG_FILE.exists():
+    global _CONFIG_CACHE
+    try:
+        st = os.stat(CONFIG_FILE)
+    except OSError:
+        return {}
+
+    key = (st.st_mtime_ns, st.st_size)
+    if _CONFIG_CACHE is None or _CONFIG_CACHE[0] != key:
         try:
-            return json.loads(CONFIG_FILE.read_text())
+            _CONFIG_CACHE = (key, _json_loads(CONFIG_FILE.read_bytes()))
         except Exception:
-            pass
-    return {}
+            return {}
+    # Callers may modify and save the result, so hand out a copy
+    return dict(_CONFIG_CACHE[1])
+
+
+def reset_config_cache():
+    """Forget cached configuration, e.g. after config.json was written."""
+    global _CONFIG_CACHE
+    _CONFIG_CACHE = None
+    get_ollama_url.cache_clear()
 
 
 def save_config(config: Dict[str, Any]) -> bool:
     """Save Kit configuration to ~/.kit/config.json"""
     try:
         CONFIG_DIR.mkdir(parents=True, exist_ok=True)
-        CONFIG_FILE.write_text(json.dumps(config, indent=2))
+        _atomic_write(CONFIG_FILE, _json_dumps(config, indent=True))
+        reset_config_cache()
         return True
     except Exception:
         return False
 
 
+@functools.lru_cache(maxsize=1)
 def get_ollama_url() -> str:
     """
     Get Ollama API URL from (in order of priority):
     1. Environment variable: KIT_OLLAMA_URL
     2. Config file: ~/.kit/config.json -> ollama_url
     3. Default: http://localhost:11434
+
+    The result is cached; call reset_config_cache() to re-read it.
     """
     # 1. Environment variable
     env_url = os.environ.get("KIT_OLLAMA_URL")
@@ -60,7 +174,28 @@ def get_ollama_url() -> str:
     return "http://localhost:11434"
 
 
-@dataclass
+@functools.lru_cache(maxsize=8)
+def _parse_registry(path: str, mtime_ns: int, size: int) -> Dict[str, Any]:
+    """
+    Parse the packages section of a registry file.
+
+    Keyed on (path, mtime, size) so a changed file is re-parsed while
+    repeated loads of the same file within one process are free.
+    """
+    data = _json_load_file(Path(path))
+    return data.get("packages", {})
+
+
+def _intern(value: Any) -> Any:
+    """Intern strings from the registry; other JSON values pass through."""
+    return sys.intern(value) if isinstance(value, str) else value
+
+
+# Slotted instances drop the per-package __dict__ (dataclass slots need 3.10+)
+_SLOTS = {"slots": True} if sys.version_info >= (3, 10) else {}
+
+
+@dataclass(frozen=True, **_SLOTS)
 class Package:
     """A HumoticaOS package."""
     name: str
@@ -71,104 +206,450 @@ class Package:
     snaft_verified: bool
     pypi: Optional[str] = None
     npm: Optional[str] = None
-    dependencies: List[str] = None
+    dependencies: Tuple[str, ...] = ()
     mcp_config: Optional[Dict] = None
     author: str = "Unknown"
+    # Meets minimum trust requirements; derived once from the fields above
+    is_trusted: bool = field(init=False, repr=False, compare=False)
 
     def __post_init__(self):
-        if self.dependencies is None:
-            self.dependencies = []
-
-    @property
-    def is_trusted(self) -> bool:
-        """Check if package meets minimum trust requirements."""
-        return (
+        object.__setattr__(self, "is_trusted", (
             self.trust_score >= 0.5 and
             self.jis_compliant and
             self.snaft_verified
+        ))
+
+    @classmethod
+    def from_dict(cls, name: str, data: Dict[str, Any]) -> "Package":
+        """Build a Package from a registry entry stored under name."""
+        trust_score = data.get("trust_score", 0)
+        # is_trusted compares it on construction; a null or string score
+        # counts as untrusted rather than breaking the registry load
+        if not isinstance(trust_score, (int, float)):
+            trust_score = 0
+        return cls(
+            name=data.get("name", name),
+            version=_intern(data.get("version", "0.0.0")),
+            description=data.get("description", ""),
+            trust_score=trust_score,
+            jis_compliant=data.get("jis_compliant", False),
+            snaft_verified=data.get("snaft_verified", False),
+            pypi=data.get("pypi"),
+            npm=data.get("npm"),
+            dependencies=tuple(data.get("dependencies") or ()),
+            mcp_config=data.get("mcp_config"),
+            author=_intern(data.get("author", "Unknown")),
         )
 
 
+@functools.lru_cache(maxsize=1)
+def _resolve_registry_path() -> Path:
+    """Get default registry path, resolved once per process."""
+    locations = [
+        Path(__file__).parent / "packages.json",
+        CONFIG_DIR / "packages.json",
+    ]
+    for loc in locations:
+        try:
+            os.stat(loc)
+        except OSError:
+            continue
+        return loc
+    return locations[0]
+
+
+# Bump when Package field types or the way entries are built change in a
+# way field names don't show
+_SIDECAR_FORMAT = 3
+
+
+def _sidecar_key(path: Path, st: os.stat_result) -> Tuple:
+    """Identify a registry file version and the Package layout it was built with."""
+    return (_SIDECAR_FORMAT, str(path), st.st_mtime_ns, st.st_size,
+            tuple(f.name for f in fields(Package)))
+
+
+def _load_sidecar(key: Tuple) -> Optional[Dict[str, Package]]:
+    """Load pickled Package objects if they were built from this registry file."""
+    try:
+        with REGISTRY_CACHE_FILE.open("rb") as f:
+            cached_key, packages = pickle.load(f)
+        if cached_key == key:
+            return packages
+    except Exception:
+        pass
+    return None
+
+
+def _save_sidecar(key: Tuple, packages: Dict[str, Package]):
+    """Pickle Package objects to ~/.kit/packages.pkl"""
+    try:
+        CONFIG_DIR.mkdir(parents=True, exist_ok=True)
+        _atomic_write(REGISTRY_CACHE_FILE, pickle.dumps((key, packages), pickle.HIGHEST_PROTOCOL))
+    except Exception:
+        pass
+
+
 class PackageRegistry:
     """HumoticaOS Package Registry."""
 
     REGISTRY_URL = "https://humotica.com/packages/packages.json"
 
     def __init__(self, registry_path: Optional[Path] = None):
-        self.registry_path = registry_path or self._default_registry_path()
+        self.registry_path = registry_path or _resolve_registry_path()
         self._packages: Dict[str, Package] = {}
-        self._load()
-
-    def _default_registry_path(self) -> Path:
-        """Get default registry path."""
-        locations = [
-            Path(__file__).parent / "packages.json",
-            Path.home() / ".kit" / "packages.json",
-        ]
-        for loc in locations:
-            if loc.exists():
-                return loc
-        return locations[0]
+        self._search_index: List[Package] = []
+        self._blob = ""
+        self._offsets: List[int] = []
+        self._sorted_names: List[str] = []
+        # The registry is read on first use, so commands that never
+        # touch it (help, config, doctor) don't pay for loading it
+        self._loaded = False
+        self._load_lock = threading.Lock()
+
+    def _ensure_loaded(self):
+        """Load the registry on first access."""
+        if not self._loaded:
+            with self._load_lock:
+                if not self._loaded:
+                    self._load()
 
     def _load(self):
         """Load packages from registry file."""
-        if not self.registry_path.exists():
-            self._packages = {}
-            return
-
+        self._packages = {}
         try:
-            data = json.loads(self.registry_path.read_text())
-            for name, pkg_data in data.get("packages", {}).items():
-                self._packages[name] = Package(
-                    name=pkg_data.get("name", name),
-                    version=pkg_data.get("version", "0.0.0"),
-                    description=pkg_data.get("description", ""),
-                    trust_score=pkg_data.get("trust_score", 0),
-                    jis_compliant=pkg_data.get("jis_compliant", False),
-                    snaft_verified=pkg_data.get("snaft_verified", False),
-                    pypi=pkg_data.get("pypi"),
-                    npm=pkg_data.get("npm"),
-                    dependencies=pkg_data.get("dependencies", []),
-                    mcp_config=pkg_data.get("mcp_config"),
-                    author=pkg_data.get("author", "Unknown"),
+            st = self.registry_path.stat()
+            key = _sidecar_key(self.registry_path, st)
+            packages = _load_sidecar(key)
+            if packages is None:
+                packages = self._build_packages(
+                    _parse_registry(str(self.registry_path), st.st_mtime_ns, st.st_size)
                 )
+                _save_sidecar(key, packages)
+            self._packages = packages
+        except FileNotFoundError:
+            pass
         except Exception as e:
             print(f"Warning: Could not load registry: {e}")
             self._packages = {}
+        self._build_index()
+        self._loaded = True
+
+    @staticmethod
+    def _build_packages(packages: Dict[str, Any]) -> Dict[str, Package]:
+        """
+        Build Package objects from the registry's packages section.
+
+        A malformed entry is skipped with a warning instead of discarding
+        the whole registry.
+        """
+        built = {}
+        for name, pkg_data in packages.items():
+            try:
+                built[name.lower()] = Package.from_dict(name, pkg_data)
+            except Exception as e:
+                print(f"Warning: Skipping package '{name}': {e}")
+        return built
+
+    def _build_index(self):
+        """
+        Build the search structures from self._packages.
+
+        Each package's key, name and description are lowercased once into
+        a single haystack ("key\\x00name\\x00description"), and all
+        haystacks are joined with \\x01 into one buffer. self._offsets
+        holds the start of each package, so one str.find over the blob
+        replaces a Python-level loop over every package.
+        """
+        offsets = []
+        hays = []
+        pos = 0
+        for key, pkg in self._packages.items():
+            hay = f"{key}\x00{pkg.name}\x00{pkg.description}".lower()
+            offsets.append(pos)
+            hays.append(hay)
+            pos += len(hay) + 1
+        self._search_index = list(self._packages.values())
+        self._blob = "\x01".join(hays)
+        self._offsets = offsets
+        self._sorted_names = sorted(self._packages)
+
+    def _scan(self, term: str, limit: Optional[int] = None) -> List[int]:
+        """Return indexes into the search index whose haystack contains term."""
+        if "\x00" in term or "\x01" in term:
+            return []
+        hits = []
+        offsets = self._offsets
+        find = self._blob.find
+        pos = find(term)
+        while pos != -1:
+            i = bisect.bisect_right(offsets, pos) - 1
+            hits.append(i)
+            if i + 1 >= len(offsets) or len(hits) == limit:
+                break
+            # Skip to the next package; one hit per package is enough
+            pos = find(term, offsets[i + 1])
+        return hits
 
     def get(self, name: str) -> Optional[Package]:
         """Get a package by name."""
+        self._ensure_loaded()
         return self._packages.get(name.lower())
 
-    def search(self, query: str) -> List[Package]:
-        """Search packages by name or description."""
-        query = query.lower()
+    def prefix_search(self, prefix: str) -> List[Package]:
+        """Get packages whose name starts with prefix, in name order."""
+        self._ensure_loaded()
+        prefix = prefix.lower()
+        names = self._sorted_names
         results = []
-        for name, pkg in self._packages.items():
-            if (query in name.lower() or
-                query in pkg.description.lower() or
-                query in pkg.name.lower()):
-                results.append(pkg)
+        for i in range(bisect.bisect_left(names, prefix), len(names)):
+            if not names[i].startswith(prefix):
+                break
+            results.append(self._packages[names[i]])
         return results
 
+    def search(self, query: str, limit: Optional[int] = None) -> List[Package]:
+        """
+        Search packages by name or description.
+
+        Multi-word queries match packages containing every word. With a
+        limit, scanning stops as soon as that many matches are found; a
+        limit of None, 0 or less returns every match.
+        """
+        self._ensure_loaded()
+        if limit is not None and limit <= 0:
+            limit = None
+        terms = query.lower().split()
+        if not terms:
+            return self._search_index[:limit]
+
+        if len(terms) == 1:
+            hits = self._scan(terms[0], limit)
+        else:
+            hits = self._scan(terms[0])
+            for term in terms[1:]:
+                if not hits:
+                    break
+                found = set(self._scan(term))
+                hits = [i for i in hits if i in found]
+            hits = hits[:limit]
+        return [self._search_index[i] for i in hits]
+
     def list_all(self) -> List[Package]:
         """List all packages."""
+        self._ensure_loaded()
         return list(self._packages.values())
 
     def update(self) -> bool:
-        """Update registry from remote."""
+        """
+        Update registry from remote.
+
+        Sends the ETag/Last-Modified of the previous download, so an
+        unchanged registry costs a 304 instead of a full transfer.
+        """
+        import urllib.error  # deferred: only `kit update` downloads with urllib
+        import urllib.request
+
+        request = urllib.request.Request(self.REGISTRY_URL)
+        # The validators only describe the file they were saved for; a
+        # reinstall or a hand edit replaces it and must get a full download
         try:
-            response = requests.get(self.REGISTRY_URL, timeout=10)
-            if response.ok:
-                self.registry_path.parent.mkdir(parents=True, exist_ok=True)
-                self.registry_path.write_text(response.text)
-                self._load()
+            st = self.registry_path.stat()
+            validators = _json_loads(REGISTRY_ETAG_FILE.read_bytes())
+            if validators.get("file") == [str(self.registry_path), st.st_mtime_ns, st.st_size]:
+                if validators.get("etag"):
+                    request.add_header("If-None-Match", validators["etag"])
+                if validators.get("last_modified"):
+                    request.add_header("If-Modified-Since", validators["last_modified"])
+        except Exception:
+            pass
+
+        try:
+            self.registry_path.parent.mkdir(parents=True, exist_ok=True)
+            # Stream straight to a temp file; a crash or a bad download
+            # never replaces the current registry.
+            # urlopen raises HTTPError for non-2xx responses
+            with urllib.request.urlopen(request, timeout=10) as response, \
+                    _atomic_open(self.registry_path) as f:
+                shutil.copyfileobj(response, f, 64 * 1024)
+                f.flush()
+                _json_load_file(Path(f.name))
+            try:
+                st = self.registry_path.stat()
+                CONFIG_DIR.mkdir(parents=True, exist_ok=True)
+                _atomic_write(REGISTRY_ETAG_FILE, _json_dumps({
+                    "file": [str(self.registry_path), st.st_mtime_ns, st.st_size],
+                    "etag": response.headers.get("ETag"),
+                    "last_modified": response.headers.get("Last-Modified"),
+                }))
+            except Exception:
+                pass
+            self._load()
+            return True
+        except urllib.error.HTTPError as e:
+            if e.code == 304:  # Not Modified: the local copy is current
                 return True
         except Exception:
             pass
         return False
 
 
+# Connection pool size of the shared HTTP session
+HTTP_POOL_MAXSIZE = 8
+
+_SESSION = None
+_SESSION_LOCK = threading.Lock()
+
+# Runs Kit AI calls in the background, created on first use
+_EXECUTOR = None
+_EXECUTOR_LOCK = threading.Lock()
+
+
+def get_session():
+    """
+    Get the process-wide keep-alive requests.Session, created on first use.
+
+    Reusing it across Kit AI calls saves a TCP (and TLS) handshake per
+    request.
+    """
+    global _SESSION
+    with _SESSION_LOCK:
+        if _SESSION is None:
+            import requests  # deferred: only network paths pay its import cost
+            from requests.adapters import HTTPAdapter
+            from urllib3.util.retry import Retry
+
+            session = requests.Session()
+            adapter = HTTPAdapter(
+                pool_connections=4,
+                pool_maxsize=HTTP_POOL_MAXSIZE,
+                max_retries=Retry(total=1, backoff_factor=0.1),
+            )
+            session.mount("http://", adapter)
+            session.mount("https://", adapter)
+            _SESSION = session
+    return _SESSION
+
+
+def _get_executor():
+    """Get the process-wide thread pool for Kit AI calls, created on first use."""
+    global _EXECUTOR
+    with _EXECUTOR_LOCK:
+        if _EXECUTOR is None:
+            # deferred: commands that never ask Kit AI skip concurrent.futures
+            from concurrent.futures import ThreadPoolExecutor
+
+            _EXECUTOR = ThreadPoolExecutor(
+                max_workers=HTTP_POOL_MAXSIZE, thread_name_prefix="kit-ai"
+            )
+    return _EXECUTOR
+
+
+# Kit AI request bodies, pre-encoded around the JSON string of the prompt
+_VALIDATE_BODY = (b'{"model":"kit","prompt":', b',"stream":false,"options":{"num_predict":100}}')
+_CHECK_BODY = (b'{"model":"kit","prompt":', b',"stream":false,"options":{"num_predict":50}}')
+
+
+def _ai_body(template: Tuple[bytes, bytes], prompt: str) -> bytes:
+    """Build a Kit AI request body without encoding a dict per call."""
+    prefix, suffix = template
+    return prefix + _json_dumps(prompt) + suffix
+
+
+class _TTLCache:
+    """Small thread-safe cache whose entries expire after ttl seconds."""
+
+    def __init__(self, maxsize: int = 256, ttl: float = 300):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data: Dict[Any, Tuple[float, Any]] = {}
+        self._lock = threading.Lock()
+
+    def get(self, key: Any) -> Any:
+        """Get a live entry, or None."""
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None or entry[0] < time.monotonic():
+                return None
+            return entry[1]
+
+    def set(self, key: Any, value: Any):
+        """Store value, evicting expired and then oldest entries when full."""
+        now = time.monotonic()
+        with self._lock:
+            if key not in self._data and len(self._data) >= self.maxsize:
+                for k in [k for k, (expiry, _) in self._data.items() if expiry < now]:
+                    del self._data[k]
+                if len(self._data) >= self.maxsize:
+                    del self._data[next(iter(self._data))]
+            self._data[key] = (now + self.ttl, value)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+
+class _DiskCache:
+    """
+    Kit AI answers persisted in SQLite, shared by all Kit processes.
+
+    Best effort: any database error behaves like a cache miss. Set
+    KIT_NO_CACHE=1 (e.g. in CI) to bypass it.
+    """
+
+    def __init__(self, path: Path, ttl: float):
+        self.path = path
+        self.ttl = ttl
+        # Schema is created on the first connection of the process
+        self._ready = False
+
+    def _connect(self):
+        import sqlite3  # deferred: only Kit AI calls need it
+
+        if not self._ready:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+        conn = sqlite3.connect(str(self.path), timeout=1)
+        if not self._ready:
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS kv (k BLOB PRIMARY KEY, v TEXT, expiry REAL)"
+            )
+            self._ready = True
+        return conn
+
+    def get(self, key: bytes) -> Optional[str]:
+        """Get a live entry, or None."""
+        if os.environ.get("KIT_NO_CACHE"):
+            return None
+        try:
+            with contextlib.closing(self._connect()) as conn:
+                row = conn.execute(
+                    "SELECT v FROM kv WHERE k = ? AND expiry > ?", (key, time.time())
+                ).fetchone()
+            return row[0] if row else None
+        except Exception:
+            # e.g. the file was removed; recreate the schema next time
+            self._ready = False
+            return None
+
+    def set(self, key: bytes, value: str):
+        """Store value for ttl seconds and drop expired entries."""
+        if os.environ.get("KIT_NO_CACHE"):
+            return
+        now = time.time()
+        try:
+            with contextlib.closing(self._connect()) as conn, conn:
+                conn.execute("DELETE FROM kv WHERE expiry <= ?", (now,))
+                conn.execute(
+                    "INSERT OR REPLACE INTO kv VALUES (?, ?, ?)",
+                    (key, value, now + self.ttl),
+                )
+        except Exception:
+            self._ready = False
+
+
+_AI_DISK_CACHE = _DiskCache(CONFIG_DIR / "ai-cache.sqlite3", ttl=24 * 3600)
+
+
 class KitValidator:
     """Kit AI Security Validator.
 
@@ -190,19 +671,65 @@ class KitValidator:
         # Or set environment variable
         # export KIT_OLLAMA_URL=http://myserver:11434
         validator = KitValidator()
+
+        # Validators share one pooled keep-alive session
+        with KitValidator() as validator:
+            for pkg in packages:
+                validator.validate(pkg)
+
+        # Bring your own requests.Session (e.g. with auth or a mock)
+        validator = KitValidator(session=my_session)
+
+        # From asyncio code
+        results = await asyncio.gather(*(validator.validate_async(p) for p in packages))
     """
 
-    def __init__(self, kit_api: Optional[str] = None):
+    def __init__(self, kit_api: Optional[str] = None, session=None):
         if kit_api:
             self.kit_api = kit_api
         else:
             base_url = get_ollama_url()
             self.kit_api = f"{base_url}/api/generate"
+        self._session = session
+        # Kit AI answers, reused for 5 minutes
+        self._cache = _TTLCache(maxsize=256, ttl=300)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    @property
+    def session(self):
+        """HTTP session: the one passed to the constructor, else the shared one."""
+        if self._session is None:
+            self._session = get_session()
+        return self._session
+
+    def close(self):
+        """
+        Release resources owned by this validator.
+
+        A validator never owns its session: the shared one stays open
+        for other validators, and a session passed to the constructor is
+        closed by whoever created it. Nothing to release at the moment;
+        kept so `with KitValidator() as validator:` stays valid.
+        """
+
+    def cache_clear(self):
+        """Forget cached Kit AI answers."""
+        self._cache.clear()
 
-    def validate(self, package: Package, action: str = "install") -> Dict[str, Any]:
+    def validate(self, package: Package, action: str = "install",
+                 skip_ai_when_definitive: bool = True) -> Dict[str, Any]:
         """
         Validate a package using Kit AI.
 
+        When the package fails every local check the verdict cannot
+        change, so Kit AI is not asked unless skip_ai_when_definitive is
+        False.
+
         Returns validation result with:
         - valid: bool
         - trust_ok: bool
@@ -210,6 +737,108 @@ class KitValidator:
         - snaft_ok: bool
         - ai_response: str (if Kit AI available)
         """
+        # Start the Kit AI round trip first; local checks run meanwhile
+        future = self._submit_ai(package, action, skip_ai_when_definitive)
+        return self._finish_validation(package, future)
+
+    async def validate_async(self, package: Package, action: str = "install",
+                             skip_ai_when_definitive: bool = True) -> Dict[str, Any]:
+        """
+        Awaitable validate() for asyncio callers.
+
+        The Kit AI call runs on the shared pool and session, so many
+        validations can be gathered without blocking the event loop.
+        """
+        import asyncio  # deferred: the CLI never needs an event loop
+
+        future = self._submit_ai(package, action, skip_ai_when_definitive)
+        try:
+            await asyncio.wrap_future(future)
+        except Exception:
+            pass  # reported as offline by _finish_validation
+        return self._finish_validation(package, future)
+
+    def validate_many(self, packages: List[Package], action: str = "install",
+                      skip_ai_when_definitive: bool = True) -> Dict[str, Dict[str, Any]]:
+        """
+        Validate several packages concurrently.
+
+        Returns {package name: validation result}. All Kit AI calls are
+        sent before any result is awaited, so total latency is roughly
+        that of the slowest call rather than the sum.
+        """
+        futures = [
+            (pkg, self._submit_ai(pkg, action, skip_ai_when_definitive))
+            for pkg in packages
+        ]
+        return {
+            pkg.name: self._finish_validation(pkg, future)
+            for pkg, future in futures
+        }
+
+    def _cache_key(self, package: Package, action: str) -> Tuple:
+        return (package.name, package.version, action, self.kit_api)
+
+    def _submit_ai(self, package: Package, action: str,
+                   skip_ai_when_definitive: bool) -> "Future":
+        """
+        Start a Kit AI check.
+
+        Returns an already-done future when the answer is cached or the
+        check is skipped.
+        """
+        from concurrent.futures import Future
+
+        if skip_ai_when_definitive and not (
+            package.trust_score >= 0.5 or
+            package.jis_compliant or
+            package.snaft_verified
+        ):
+            answer = "skipped: local checks definitive"
+        else:
+            answer = self._cache.get(self._cache_key(package, action))
+            if answer is None:
+                return _get_executor().submit(self._ask_ai, package, action)
+        future = Future()
+        future.set_result(answer)
+        return future
+
+    def _ask_ai(self, package: Package, action: str) -> Optional[str]:
+        """Ask Kit AI about a package; None if it answered with an error."""
+        answer = self._post_ai(_ai_body(_VALIDATE_BODY, f"[CHECK] {action} {package.name}"))
+        if answer is not None:
+            self._cache.set(self._cache_key(package, action), answer)
+        return answer
+
+    def _post_ai(self, body: bytes) -> Optional[str]:
+        """
+        POST a request body to Kit AI and return its answer.
+
+        Answers are kept on disk for a day, keyed on endpoint and body,
+        so they survive across runs. None if Kit AI answered with an
+        error.
+        """
+        import hashlib  # deferred: only Kit AI calls hash their requests
+
+        disk_key = hashlib.blake2b(self.kit_api.encode() + b"\0" + body, digest_size=16).digest()
+        answer = _AI_DISK_CACHE.get(disk_key)
+        if answer is not None:
+            return answer
+
+        response = self.session.post(
+            self.kit_api,
+            data=body,
+            headers={"Content-Type": "application/json"},
+            timeout=10
+        )
+        if not response.ok:
+            return None
+        answer = _json_loads(response.content).get("response", "")
+        _AI_DISK_CACHE.set(disk_key, answer)
+        return answer
+
+    def _finish_validation(self, package: Package, future: "Future") -> Dict[str, Any]:
+        """Run the local checks, then collect the Kit AI answer from future."""
         result = {
             "valid": True,
             "trust_ok": package.trust_score >= 0.5,
@@ -234,20 +863,10 @@ class KitValidator:
             result["valid"] = False
             result["warnings"].append("Package is not SNAFT verified")
 
-        # Try Kit AI validation (optional - works without it)
+        # Kit AI validation is optional - works without it. No timeout
+        # here: the POST itself already times out.
         try:
-            response = requests.post(
-                self.kit_api,
-                json={
-                    "model": "kit",
-                    "prompt": f"[CHECK] {action} {package.name}",
-                    "stream": False,
-                    "options": {"num_predict": 100}
-                },
-                timeout=10
-            )
-            if response.ok:
-                result["ai_response"] = response.json().get("response", "")
+            result["ai_response"] = future.result()
         except Exception:
             result["ai_response"] = "Kit AI offline, using local validation"
 
@@ -255,22 +874,19 @@ class KitValidator:
 
     def check_injection(self, text: str) -> Dict[str, Any]:
         """Check text for prompt injection attempts."""
+        import hashlib  # deferred: only Kit AI calls hash their requests
+
+        key = (hashlib.blake2b(text.encode(), digest_size=16).digest(), self.kit_api)
+        cached = self._cache.get(key)
+        if cached is not None:
+            return dict(cached)
+
         try:
-            response = requests.post(
-                self.kit_api,
-                json={
-                    "model": "kit",
-                    "prompt": f"[CHECK] {text}",
-                    "stream": False,
-                    "options": {"num_predict": 50}
-                },
-                timeout=10
-            )
-            if response.ok:
-                return {
-                    "checked": True,
-                    "response": response.json().get("response", "")
-                }
+            answer = self._post_ai(_ai_body(_CHECK_BODY, f"[CHECK] {text}"))
+            if answer is not None:
+                result = {"checked": True, "response": answer}
+                self._cache.set(key, result)
+                return dict(result)
         except Exception:
             pass
 